@@ -10,16 +10,96 @@ Date: 2026-02-04
 """
 
 import argparse
+import codecs
+import copy
+import io
+import logging
 import sys
 import re
+from xml.sax.saxutils import escape
 from pathlib import Path
-from typing import Optional, List, Tuple
-import mistune
+from typing import Optional, List, Tuple, Iterable, Union, BinaryIO, TextIO
 from docx import Document
-from docx.shared import RGBColor, Pt, Inches
+from docx.shared import Pt, Inches
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.oxml.ns import qn, nsdecls
+from docx.oxml import OxmlElement, parse_xml
+
+logger = logging.getLogger(__name__)
+
+
+# Precompiled patterns for the per-line / per-paragraph hot paths
+
+# Emphasis is matched lazily: an attempt only fails when no closing '*'
+# follows, which holds for the last opener alone. Code and link spans
+# exclude their own delimiters, so a failed match stops at the next opener
+# instead of rescanning the rest of the line (no quadratic backtracking on
+# runs of '[' or of '[x](' link openers). Link URLs may hold one level of
+# balanced parentheses, as in Wikipedia URLs.
+_INLINE_RE = re.compile(
+    r'(\*\*.*?\*\*|\*.*?\*|`[^`\n]+`'
+    r'|\[[^\[\]\n]+\]\((?:[^()\n]|\([^()\n]*\))+\))'
+)
+_LINK_RE = re.compile(r'\[(.*?)\]\((.*?)\)')
+_HR_RE = re.compile(r'^[-*_]{3,}$')
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+_OL_RE = re.compile(r'^(\s*)\d+\.\s+(.+)$')
+_UL_RE = re.compile(r'^(\s*)[-*+]\s+(.+)$')
+
+# Run XML for inline elements, matching what the python-docx run setters
+# produce (w:sz is in half-points)
+_RPR_PLAIN = ''
+_RPR_BOLD = '<w:rPr><w:b/></w:rPr>'
+_RPR_ITALIC = '<w:rPr><w:i/></w:rPr>'
+_RPR_CODE = (
+    '<w:rPr><w:rFonts w:ascii="Courier New" w:hAnsi="Courier New"/>'
+    '<w:sz w:val="20"/></w:rPr>'
+)
+_RPR_LINK = '<w:rPr><w:color w:val="0000FF"/><w:u w:val="single"/></w:rPr>'
+_RUN_XML = '<w:r>{rpr}{content}</w:r>'
+
+
+def _text_xml(text: str) -> str:
+    """Return escaped ``w:t`` XML for text, or '' when there is none."""
+    if not text:
+        return ''
+    if text != text.strip():
+        return f'<w:t xml:space="preserve">{escape(text)}</w:t>'
+    return f'<w:t>{escape(text)}</w:t>'
+
+
+# Bytes that surrogateescape could not decode as UTF-8
+_UNDECODABLE_RE = re.compile('[\udc80-\udcff]')
+
+
+class _MarkdownLineReader(io.TextIOWrapper):
+    """
+    UTF-8 text stream that re-decodes invalid lines as cp1252.
+
+    Must be opened with ``errors='surrogateescape'`` so that the original
+    bytes of a line that isn't valid UTF-8 can be recovered. Iteration,
+    readline() and read() all apply the fallback; a sized read decides it
+    for the part of a line it returns.
+    """
+
+    def readline(self, size: int = -1) -> str:
+        # Iterating a TextIOWrapper subclass also goes through readline
+        return self._redecode(super().readline(size))
+
+    def read(self, size: Optional[int] = -1) -> str:
+        text = super().read(size)
+        if not _UNDECODABLE_RE.search(text):
+            return text
+        return '\n'.join(self._redecode(line) for line in text.split('\n'))
+
+    @staticmethod
+    def _redecode(line: str) -> str:
+        """Decode a line as cp1252 if it wasn't valid UTF-8."""
+        if _UNDECODABLE_RE.search(line):
+            raw_line = line.encode('utf-8', 'surrogateescape')
+            line = raw_line.decode('cp1252', errors='replace')
+        return line
 
 
 class MarkdownToWordConverter:
@@ -39,6 +119,27 @@ class MarkdownToWordConverter:
         self.current_list_level = 0
         self.in_code_block = False
 
+        # Style names available in self.doc, and resolved style lookups;
+        # _indexed_doc is the document they were built for
+        self._indexed_doc = None
+        self._available_styles = None
+        self._style_cache = {}
+        self._resolved_style = {}
+        self._style_ids = {}
+
+        # Horizontal rule border and code shading, built once and
+        # deep-copied into each paragraph that needs them
+        self._hr_pbdr_template = OxmlElement('w:pBdr')
+        bottom = OxmlElement('w:bottom')
+        bottom.set(qn('w:val'), 'single')
+        bottom.set(qn('w:sz'), '6')
+        bottom.set(qn('w:space'), '1')
+        bottom.set(qn('w:color'), 'auto')
+        self._hr_pbdr_template.append(bottom)
+
+        self._code_shading_template = OxmlElement('w:shd')
+        self._code_shading_template.set(qn('w:fill'), 'F0F0F0')
+
         # Style mapping: markdown element -> Word style name
         self.style_map = {
             'h1': 'Heading 1',
@@ -65,22 +166,91 @@ class MarkdownToWordConverter:
         """
         try:
             if self.template_path and Path(self.template_path).exists():
-                print(f"📄 Loading template: {self.template_path}")
+                logger.info("📄 Loading template: %s", self.template_path)
                 return Document(self.template_path)
             else:
                 if self.template_path:
-                    print(f"⚠️  Template not found: {self.template_path}")
-                    print("📄 Creating new document with default styles")
+                    logger.warning("⚠️  Template not found: %s", self.template_path)
+                    logger.info("📄 Creating new document with default styles")
                 return Document()
         except Exception as e:
-            print(f"❌ Error loading template: {e}")
-            print("📄 Creating new document with default styles")
+            logger.warning("❌ Error loading template: %s", e)
+            logger.info("📄 Creating new document with default styles")
             return Document()
 
+    def _index_styles(self):
+        """
+        Snapshot the loaded document's styles and pre-resolve style_map.
+
+        Called once per loaded document so that the per-paragraph code
+        only does dictionary lookups. Lookups re-index when self.doc is
+        replaced by a different document.
+        """
+        self._indexed_doc = self.doc
+        self._available_styles = frozenset(s.name for s in self.doc.styles)
+        self._style_cache = {}
+        self._style_ids = {}
+        self._resolved_style = {
+            key: self.get_style_or_fallback(name, 'Normal')
+            for key, name in self.style_map.items()
+        }
+
+    def _resolve_style(self, key: str) -> str:
+        """
+        Get the pre-resolved style name for a style_map key.
+
+        Args:
+            key: style_map key, e.g. 'h1' or 'quote'
+
+        Returns:
+            Available style name
+        """
+        if self._indexed_doc is not self.doc:
+            self._index_styles()
+        return self._resolved_style.get(key, 'Normal')
+
+    def _get_style_id(self, style_name: str) -> Optional[str]:
+        """
+        Get the paragraph style id for an available style name.
+
+        Args:
+            style_name: Style name present in the document
+
+        Returns:
+            Style id, or None for the default paragraph style
+        """
+        try:
+            return self._style_ids[style_name]
+        except KeyError:
+            style_id = self.doc.part.get_style_id(style_name, WD_STYLE_TYPE.PARAGRAPH)
+            self._style_ids[style_name] = style_id
+            return style_id
+
+    def _add_styled_paragraph(self, style_name: str):
+        """
+        Add an empty paragraph with the given style.
+
+        Equivalent to ``self.doc.add_paragraph(style=style_name)``, but sets
+        the cached style id directly instead of having python-docx resolve
+        the name against every style in the document.
+
+        Args:
+            style_name: Style name present in the document
+
+        Returns:
+            The new paragraph
+        """
+        paragraph = self.doc.add_paragraph()
+        paragraph._p.style = self._get_style_id(style_name)
+        return paragraph
+
     def get_style_or_fallback(self, preferred_style: str, fallback: str = 'Normal') -> str:
         """
         Get style name from document or fallback to default.
 
+        Resolutions are cached per (preferred_style, fallback) pair for the
+        lifetime of the loaded document.
+
         Args:
             preferred_style: Preferred style name
             fallback: Fallback style name
@@ -88,69 +258,100 @@ class MarkdownToWordConverter:
         Returns:
             Available style name
         """
-        available_styles = [s.name for s in self.doc.styles]
+        if self._indexed_doc is not self.doc:
+            self._index_styles()
+
+        key = (preferred_style, fallback)
+        style_name = self._style_cache.get(key)
+        if style_name is not None:
+            return style_name
 
-        if preferred_style in available_styles:
-            return preferred_style
+        available_styles = self._available_styles
 
-        # Try variations
-        variations = [
+        # Try the preferred name, then variations of it
+        candidates = [
+            preferred_style,
             preferred_style.replace(' ', ''),
             preferred_style.replace(' ', '_'),
             preferred_style.lower(),
-            preferred_style.upper()
+            preferred_style.upper(),
+            fallback
         ]
 
-        for variation in variations:
-            if variation in available_styles:
-                return variation
-
-        # Fallback
-        if fallback in available_styles:
-            return fallback
-
-        return 'Normal'
+        style_name = next(
+            (c for c in candidates if c in available_styles), 'Normal'
+        )
+        self._style_cache[key] = style_name
+        return style_name
 
-    def read_markdown_file(self, md_path: str) -> str:
+    def read_markdown_file(self, md_path: str) -> TextIO:
         """
-        Read markdown file content.
+        Open markdown file for line-by-line reading.
+
+        The file is streamed rather than loaded whole, so only one line is
+        held in memory at a time. The encoding is sniffed from a byte order
+        mark; without one, lines are decoded as UTF-8, falling back to
+        cp1252 for lines that are not valid UTF-8.
 
         Args:
             md_path: Path to markdown file
 
         Returns:
-            File content as string
+            Open text stream over the file's lines; the caller closes it
+            (e.g. with a ``with`` block)
 
         Raises:
             FileNotFoundError: If file doesn't exist
-            UnicodeDecodeError: If file encoding is invalid
         """
         md_file = Path(md_path)
 
-        if not md_file.exists():
-            raise FileNotFoundError(f"Markdown file not found: {md_path}")
+        # Opening is the existence check; no separate stat() needed
+        try:
+            md_stream = md_file.open('rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Markdown file not found: {md_path}") from None
+
+        try:
+            md_text = self._wrap_text_stream(md_stream)
+        except Exception:
+            md_stream.close()
+            raise
 
         if not md_file.suffix.lower() in ['.md', '.markdown']:
-            print(f"⚠️  Warning: File doesn't have .md extension: {md_path}")
+            logger.warning("⚠️  Warning: File doesn't have .md extension: %s", md_path)
 
-        try:
-            content = md_file.read_text(encoding='utf-8')
-            print(f"✅ Read {len(content)} characters from {md_file.name}")
-            return content
-        except UnicodeDecodeError:
-            # Try alternative encodings
-            for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                try:
-                    content = md_file.read_text(encoding=encoding)
-                    print(f"✅ Read file using {encoding} encoding")
-                    return content
-                except UnicodeDecodeError:
-                    continue
-            raise UnicodeDecodeError(
-                'utf-8', b'', 0, 1, 
-                f"Unable to decode file with any standard encoding"
+        logger.info("✅ Opened %s", md_file.name)
+        return md_text
+
+    @staticmethod
+    def _wrap_text_stream(md_stream: BinaryIO) -> TextIO:
+        """
+        Wrap an open markdown file in a decoding text stream.
+
+        Each byte is read and decoded once: a BOM selects the codec up
+        front instead of retrying whole-file decodes. Closing the returned
+        stream closes md_stream.
+
+        Args:
+            md_stream: Markdown file opened in binary mode
+
+        Returns:
+            Text stream over md_stream
+        """
+        bom = md_stream.read(2)
+        md_stream.seek(0)
+
+        # Both readers split on LF, CRLF and lone CR (newline=None)
+        if bom in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            return io.TextIOWrapper(
+                md_stream, encoding='utf-16', errors='replace', newline=None
             )
 
+        # utf-8-sig drops a UTF-8 BOM so it doesn't end up in the first line
+        return _MarkdownLineReader(
+            md_stream, encoding='utf-8-sig', errors='surrogateescape', newline=None
+        )
+
     def parse_inline_formatting(self, text: str, paragraph):
         """
         Parse and apply inline formatting (bold, italic, code, links).
@@ -159,66 +360,87 @@ class MarkdownToWordConverter:
             text: Text with markdown inline formatting
             paragraph: Document paragraph object to add runs to
         """
-        # Pattern for inline elements: **bold**, *italic*, `code`, [link](url)
-        # This regex handles nested and mixed formatting
-        pattern = r'(\*\*.*?\*\*|\*.*?\*|`.*?`|\[.*?\]\(.*?\))'
+        if not text:
+            return
+
+        # Fast path: too short for a span, or no inline markers at all, so
+        # the text is a single plain run
+        if len(text) < 2 or ('*' not in text and '`' not in text and '[' not in text):
+            paragraph.add_run(text)
+            return
 
-        parts = re.split(pattern, text)
+        # Inline elements: **bold**, *italic*, `code`, [link](url)
+        parts = _INLINE_RE.split(text)
 
+        # Collect (text, run properties XML) per run
+        runs = []
         for part in parts:
             if not part:
                 continue
 
-            run = paragraph.add_run()
-
             # Bold: **text**
             if part.startswith('**') and part.endswith('**'):
-                run.text = part[2:-2]
-                run.bold = True
+                runs.append((part[2:-2], _RPR_BOLD))
 
             # Italic: *text* (but not if it's part of **)
             elif part.startswith('*') and part.endswith('*') and not part.startswith('**'):
-                run.text = part[1:-1]
-                run.italic = True
+                runs.append((part[1:-1], _RPR_ITALIC))
 
             # Inline code: `text`
             elif part.startswith('`') and part.endswith('`'):
-                run.text = part[1:-1]
-                run.font.name = 'Courier New'
-                run.font.size = Pt(10)
-
-            # Link: [text](url)
-            elif part.startswith('[') and '](' in part:
-                match = re.match(r'\[(.*?)\]\((.*?)\)', part)
-                if match:
-                    link_text, url = match.groups()
-                    run.text = link_text
-                    # Add hyperlink styling
-                    run.font.color.rgb = RGBColor(0, 0, 255)
-                    run.underline = True
+                runs.append((part[1:-1], _RPR_CODE))
+
+            # Link: [text](url), only when the whole part is the link; a
+            # plain part that merely starts with one keeps all its text
+            elif (part.startswith('[') and part.endswith(')')
+                  and _LINK_RE.fullmatch(part)):
+                link_text, url = _LINK_RE.fullmatch(part).groups()
+                # Add hyperlink styling
+                runs.append((link_text, _RPR_LINK))
 
             # Plain text
             else:
-                run.text = part
+                runs.append((part, _RPR_PLAIN))
+
+        paragraph._p.extend(self._build_runs(runs))
+
+    @staticmethod
+    def _build_runs(runs: List[Tuple[str, str]]) -> List:
+        """
+        Build ``w:r`` elements for a paragraph with a single XML parse.
+
+        Mirrors what python-docx's run setters would produce, without
+        creating each run and its properties element by element.
+
+        Args:
+            runs: (text, run properties XML) per run
+
+        Returns:
+            List of ``w:r`` oxml elements
+        """
+        xml = []
+        for text, rpr in runs:
+            # Tabs become <w:tab/> elements, as with Run.text
+            if '\t' in text:
+                content = '<w:tab/>'.join(_text_xml(s) for s in text.split('\t'))
+            else:
+                content = _text_xml(text)
+            xml.append(_RUN_XML.format(rpr=rpr, content=content))
+
+        return list(parse_xml(f'<w:p {nsdecls("w")}>{"".join(xml)}</w:p>'))
 
     def add_heading(self, text: str, level: int):
         """
         Add heading to document.
 
         Args:
-            text: Heading text
+            text: Heading text, without the leading '#' markers
             level: Heading level (1-6)
         """
-        style_key = f'h{level}'
-        style_name = self.get_style_or_fallback(
-            self.style_map.get(style_key, 'Normal'),
-            'Normal'
-        )
+        style_name = self._resolve_style(f'h{level}')
+        text = text.strip()
 
-        # Remove markdown heading markers
-        text = re.sub(r'^#{1,6}\s+', '', text).strip()
-
-        paragraph = self.doc.add_paragraph(style=style_name)
+        paragraph = self._add_styled_paragraph(style_name)
         self.parse_inline_formatting(text, paragraph)
 
     def add_paragraph(self, text: str, style: str = 'Normal'):
@@ -230,11 +452,11 @@ class MarkdownToWordConverter:
             style: Word style name
         """
         if not text.strip():
-            self.doc.add_paragraph()
+            self._append_body_elements([OxmlElement('w:p')])
             return
 
         style_name = self.get_style_or_fallback(style, 'Normal')
-        paragraph = self.doc.add_paragraph(style=style_name)
+        paragraph = self._add_styled_paragraph(style_name)
         self.parse_inline_formatting(text, paragraph)
 
     def add_list_item(self, text: str, ordered: bool = False, level: int = 0):
@@ -242,21 +464,13 @@ class MarkdownToWordConverter:
         Add list item to document.
 
         Args:
-            text: List item text
+            text: List item text, without the bullet or number marker
             ordered: True for numbered list, False for bullet list
             level: Nesting level (0-based)
         """
-        style_key = 'numbered' if ordered else 'bullet'
-        style_name = self.get_style_or_fallback(
-            self.style_map.get(style_key, 'Normal'),
-            'Normal'
-        )
+        style_name = self._resolve_style('numbered' if ordered else 'bullet')
 
-        # Remove markdown list markers
-        text = re.sub(r'^[\*\-\+]\s+', '', text)  # Unordered
-        text = re.sub(r'^\d+\.\s+', '', text)     # Ordered
-
-        paragraph = self.doc.add_paragraph(style=style_name)
+        paragraph = self._add_styled_paragraph(style_name)
 
         # Apply indentation for nested lists
         if level > 0:
@@ -264,53 +478,57 @@ class MarkdownToWordConverter:
 
         self.parse_inline_formatting(text, paragraph)
 
-    def add_code_block(self, code: str, language: str = ''):
+    def add_code_block(self, lines: Union[str, List[str]], language: str = ''):
         """
         Add code block to document.
 
         Args:
-            code: Code content
+            lines: Code lines (a single string is split on newlines)
             language: Programming language (for reference)
         """
-        style_name = self.get_style_or_fallback(
-            self.style_map.get('code_block', 'Normal'),
-            'Normal'
-        )
+        if isinstance(lines, str):
+            lines = lines.split('\n')
 
-        # Split code into lines and add each as separate paragraph
-        lines = code.split('
-')
+        style_name = self._resolve_style('code_block')
+        style_id = self._get_style_id(style_name)
 
+        # Build one detached paragraph per code line, then insert them all
+        # into the body together
+        paragraphs = []
         for line in lines:
-            paragraph = self.doc.add_paragraph(line, style=style_name)
+            p = OxmlElement('w:p')
+            p.style = style_id
+            if line:
+                r = p.add_r()
+                r.text = line
+
+                # Apply code font if style doesn't exist
+                if style_name == 'Normal':
+                    rPr = r.get_or_add_rPr()
+                    rPr.rFonts_ascii = 'Courier New'
+                    rPr.rFonts_hAnsi = 'Courier New'
+                    rPr.sz_val = Pt(9)
 
-            # Apply code formatting if style doesn't exist
             if style_name == 'Normal':
-                for run in paragraph.runs:
-                    run.font.name = 'Courier New'
-                    run.font.size = Pt(9)
-
                 # Add light gray background shading
-                shading_elm = OxmlElement('w:shd')
-                shading_elm.set(qn('w:fill'), 'F0F0F0')
-                paragraph._element.get_or_add_pPr().append(shading_elm)
+                p.get_or_add_pPr().append(
+                    copy.deepcopy(self._code_shading_template)
+                )
+
+            paragraphs.append(p)
+
+        self._append_body_elements(paragraphs)
 
     def add_blockquote(self, text: str):
         """
         Add blockquote to document.
 
         Args:
-            text: Quote text
+            text: Quote text, without the leading '>' marker
         """
-        style_name = self.get_style_or_fallback(
-            self.style_map.get('quote', 'Normal'),
-            'Normal'
-        )
+        style_name = self._resolve_style('quote')
 
-        # Remove markdown quote marker
-        text = re.sub(r'^>\s+', '', text)
-
-        paragraph = self.doc.add_paragraph(style=style_name)
+        paragraph = self._add_styled_paragraph(style_name)
 
         # Apply quote formatting if style doesn't exist
         if style_name == 'Normal':
@@ -319,6 +537,28 @@ class MarkdownToWordConverter:
 
         self.parse_inline_formatting(text, paragraph)
 
+    def _append_body_elements(self, elements: List):
+        """
+        Insert detached block-level elements at the end of the document body.
+
+        Bypasses the python-docx paragraph API: elements are placed straight
+        before the body's trailing section properties, as python-docx would.
+
+        Args:
+            elements: ``w:p`` (or other block-level) oxml elements
+        """
+        body = self.doc.element.body
+        try:
+            last = body[-1]
+        except IndexError:
+            last = None
+
+        if last is not None and last.tag == qn('w:sectPr'):
+            for element in elements:
+                last.addprevious(element)
+        else:
+            body.extend(elements)
+
     def add_horizontal_rule(self):
         """Add horizontal rule (line) to document."""
         paragraph = self.doc.add_paragraph()
@@ -327,113 +567,106 @@ class MarkdownToWordConverter:
 
         # Add bottom border to create horizontal line
         pPr = paragraph._element.get_or_add_pPr()
-        pBdr = OxmlElement('w:pBdr')
-        bottom = OxmlElement('w:bottom')
-        bottom.set(qn('w:val'), 'single')
-        bottom.set(qn('w:sz'), '6')
-        bottom.set(qn('w:space'), '1')
-        bottom.set(qn('w:color'), 'auto')
-        pBdr.append(bottom)
-        pPr.append(pBdr)
+        pPr.append(copy.deepcopy(self._hr_pbdr_template))
 
-    def process_markdown_lines(self, md_content: str):
+    def process_markdown_lines(self, lines: Union[str, Iterable[str]]):
         """
         Process markdown content line by line.
 
         Args:
-            md_content: Markdown file content
-        """
-        lines = md_content.split('
-')
-        i = 0
-        in_code_block = False
-        code_buffer = []
-        code_language = ''
+            lines: Markdown content, or an iterable of its lines
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        lines = iter(lines)
         in_list = False
 
-        while i < len(lines):
-            line = lines[i]
-
-            # Code block detection
-            if line.strip().startswith('```'):
-                if not in_code_block:
-                    # Start code block
-                    in_code_block = True
-                    code_language = line.strip()[3:].strip()
-                    code_buffer = []
-                else:
-                    # End code block
-                    in_code_block = False
-                    self.add_code_block('
-'.join(code_buffer), code_language)
-                    code_buffer = []
-                    code_language = ''
-                i += 1
+        if self._indexed_doc is not self.doc:
+            self._index_styles()
+
+        # Local aliases for the hot loop
+        match_hr = _HR_RE.match
+        match_heading = _HEADING_RE.match
+        match_ordered = _OL_RE.match
+        match_unordered = _UL_RE.match
+        add_heading = self.add_heading
+        add_paragraph = self.add_paragraph
+        add_list_item = self.add_list_item
+        add_blockquote = self.add_blockquote
+        append_body_elements = self._append_body_elements
+
+        for line in lines:
+            line = line.rstrip('\r\n')
+            stripped = line.strip()
+            first = stripped[:1]
+
+            # Code block: consume lines up to the closing fence in an inner
+            # loop. They are kept verbatim, so only strip when a line starts
+            # with whitespace and might be an indented fence.
+            if first == '`' and stripped.startswith('```'):
+                code_language = stripped[3:].strip()
+                code_buffer = []
+                for line in lines:
+                    line = line.rstrip('\r\n')
+                    if line.startswith('```') or (
+                        line[:1].isspace() and line.lstrip().startswith('```')
+                    ):
+                        self.add_code_block(code_buffer, code_language)
+                        break
+                    code_buffer.append(line)
                 continue
 
-            # Inside code block
-            if in_code_block:
-                code_buffer.append(line)
-                i += 1
+            # Empty line
+            if not first:
+                if in_list:
+                    in_list = False
+                append_body_elements([OxmlElement('w:p')])
                 continue
 
+            # Dispatch on the first non-space character so only the pattern
+            # that can possibly match is tried.
+
             # Horizontal rule
-            if re.match(r'^[-*_]{3,}$', line.strip()):
+            if first in '-*_' and match_hr(stripped):
                 self.add_horizontal_rule()
-                i += 1
                 continue
 
             # Headings
-            heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-            if heading_match:
-                level = len(heading_match.group(1))
-                text = heading_match.group(2)
-                self.add_heading(text, level)
-                in_list = False
-                i += 1
-                continue
+            if first == '#':
+                heading_match = match_heading(line)
+                if heading_match:
+                    hashes, text = heading_match.groups()
+                    add_heading(text, len(hashes))
+                    in_list = False
+                    continue
 
             # Blockquote
-            if line.strip().startswith('>'):
-                self.add_blockquote(line)
+            elif first == '>':
+                add_blockquote(stripped[1:].lstrip())
                 in_list = False
-                i += 1
                 continue
 
             # Ordered list
-            ordered_match = re.match(r'^(\s*)\d+\.\s+(.+)$', line)
-            if ordered_match:
-                indent = len(ordered_match.group(1))
-                text = ordered_match.group(2)
-                level = indent // 2
-                self.add_list_item(text, ordered=True, level=level)
-                in_list = True
-                i += 1
-                continue
+            elif first.isdigit():
+                ordered_match = match_ordered(line)
+                if ordered_match:
+                    indent, text = ordered_match.groups()
+                    add_list_item(text, ordered=True, level=len(indent) // 2)
+                    in_list = True
+                    continue
 
             # Unordered list
-            unordered_match = re.match(r'^(\s*)[-*+]\s+(.+)$', line)
-            if unordered_match:
-                indent = len(unordered_match.group(1))
-                text = unordered_match.group(2)
-                level = indent // 2
-                self.add_list_item(text, ordered=False, level=level)
-                in_list = True
-                i += 1
-                continue
-
-            # Empty line
-            if not line.strip():
-                if in_list:
-                    in_list = False
-                self.doc.add_paragraph()
-                i += 1
-                continue
+            elif first in '-*+':
+                unordered_match = match_unordered(line)
+                if unordered_match:
+                    indent, text = unordered_match.groups()
+                    add_list_item(text, ordered=False, level=len(indent) // 2)
+                    in_list = True
+                    continue
 
             # Regular paragraph
-            self.add_paragraph(line)
+            add_paragraph(line)
             in_list = False
-            i += 1
 
     def convert(self, md_path: str, output_path: Optional[str] = None) -> str:
         """
@@ -450,29 +683,22 @@ class MarkdownToWordConverter:
             FileNotFoundError: If markdown file not found
             PermissionError: If unable to write output file
         """
-        print("
-" + "="*60)
-        print("MARKDOWN TO WORD CONVERTER")
-        print("="*60 + "
-")
+        logger.info("\n" + "="*60)
+        logger.info("MARKDOWN TO WORD CONVERTER")
+        logger.info("="*60 + "\n")
 
         # Read markdown file
-        print("📖 Reading markdown file...")
-        md_content = self.read_markdown_file(md_path)
-
-        # Load template
-        print("
-📋 Loading template...")
-        self.doc = self.load_template()
-
-        # List available styles for debugging
-        available_styles = [s.name for s in self.doc.styles]
-        print(f"✅ Template loaded with {len(available_styles)} styles")
-
-        # Process markdown
-        print("
-🔄 Converting markdown to Word...")
-        self.process_markdown_lines(md_content)
+        logger.info("📖 Reading markdown file...")
+        with self.read_markdown_file(md_path) as md_lines:
+            # Load template
+            logger.info("\n📋 Loading template...")
+            self.doc = self.load_template()
+            self._index_styles()
+            logger.debug("✅ Template loaded with %d styles", len(self._available_styles))
+
+            # Process markdown
+            logger.info("\n🔄 Converting markdown to Word...")
+            self.process_markdown_lines(md_lines)
 
         # Determine output path
         if not output_path:
@@ -482,12 +708,11 @@ class MarkdownToWordConverter:
         output_file = Path(output_path)
 
         # Save document
-        print(f"
-💾 Saving document to: {output_file}")
+        logger.info("\n💾 Saving document to: %s", output_file)
         try:
             self.doc.save(str(output_file))
-            print(f"✅ Conversion successful!")
-            print(f"📄 Output: {output_file.absolute()}")
+            logger.info("✅ Conversion successful!")
+            logger.info("📄 Output: %s", output_file.absolute())
             return str(output_file)
         except PermissionError:
             raise PermissionError(
@@ -544,6 +769,11 @@ Examples:
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(message)s'
+    )
+
     try:
         # Create converter
         converter = MarkdownToWordConverter(template_path=args.template)
@@ -551,31 +781,25 @@ Examples:
         # Convert file
         output_path = converter.convert(args.markdown_file, args.output)
 
-        print("
-" + "="*60)
+        print("\n" + "="*60)
         print("CONVERSION COMPLETE")
         print("="*60)
-        print(f"
-✅ Successfully converted:")
+        print(f"\n✅ Successfully converted:")
         print(f"   Input:  {args.markdown_file}")
-        print(f"   Output: {output_path}
-")
+        print(f"   Output: {output_path}\n")
 
         return 0
 
     except FileNotFoundError as e:
-        print(f"
-❌ ERROR: {e}", file=sys.stderr)
+        print(f"\n❌ ERROR: {e}", file=sys.stderr)
         return 1
 
     except PermissionError as e:
-        print(f"
-❌ ERROR: {e}", file=sys.stderr)
+        print(f"\n❌ ERROR: {e}", file=sys.stderr)
         return 1
 
     except Exception as e:
-        print(f"
-❌ UNEXPECTED ERROR: {e}", file=sys.stderr)
+        print(f"\n❌ UNEXPECTED ERROR: {e}", file=sys.stderr)
         if args.verbose:
             import traceback
             traceback.print_exc()